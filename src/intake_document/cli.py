@@ -16,7 +16,6 @@ from rich.traceback import install as install_rich_traceback
 
 # Local application imports
 from intake_document.config import config
-from intake_document.processor import DocumentProcessor
 from intake_document.utils.exceptions import (
     ConfigError,
     DocumentError,
@@ -65,6 +64,12 @@ def main(
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Show verbose output"
     ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        "-f",
+        help="Convert files again even if unchanged since the last run",
+    ),
 ) -> None:
     """Convert documents to markdown using Mistral.ai OCR."""
     # Setup logging
@@ -80,7 +85,8 @@ def main(
             + f"config_path={config_path}, "
             + f"log_level={log_level}, "
             + f"show_config={show_config}, "
-            + f"verbose={verbose}"
+            + f"verbose={verbose}, "
+            + f"force={force}"
         )
 
         # Adjust config if config path is specified
@@ -112,6 +118,10 @@ def main(
                 logger.info(f"Setting output directory to: {output_dir}")
                 config.settings.app.output_dir = str(output_dir)
 
+            # Imported here so --help and --show-config do not load the
+            # Mistral SDK and its HTTP stack
+            from intake_document.processor import DocumentProcessor
+
             # Initialize processor
             with Progress(
                 SpinnerColumn(),
@@ -119,7 +129,7 @@ def main(
                 transient=True,
             ) as progress:
                 progress.add_task("init", total=None)
-                processor = DocumentProcessor()
+                processor = DocumentProcessor(force=force)
 
             if input_path.is_file():
                 # Process a single file
@@ -191,7 +201,7 @@ def main(
         if e.detail:
             if verbose:
                 console.print(f"[dim]{e.detail}[/dim]")
-            logger.debug(f"OCR error detail: {e.detail}")
+            logger.debug("OCR error detail: %s", e.detail)
         raise typer.Exit(1)
 
     except ConfigError as e:
@@ -74,7 +74,7 @@ class Config:
         config_path = self._get_config_path()
         if config_path.exists():
             try:
-                self.logger.debug(f"Reading config file: {config_path}")
+                self.logger.debug("Reading config file: %s", config_path)
                 parser = configparser.ConfigParser()
                 parser.read(str(config_path))
 
@@ -99,13 +99,15 @@ class Config:
             "MISTRAL_API_KEY": ("mistral", "api_key"),
             "INTAKE_DOCUMENT_OUTPUT_DIR": ("app", "output_dir"),
             "INTAKE_DOCUMENT_LOG_LEVEL": ("app", "log_level"),
+            "INTAKE_DOCUMENT_CACHE_DIR": ("app", "cache_dir"),
+            "INTAKE_DOCUMENT_BATCH_SIZE": ("mistral", "batch_size"),
         }
 
         for env_var, (section, key) in env_vars.items():
             value = os.environ.get(env_var)
             if value:
                 config_data[section][key] = value
-                self.logger.debug(f"Using environment variable {env_var}")
+                self.logger.debug("Using environment variable %s", env_var)
 
         # Validate and create settings
         try:
@@ -143,7 +145,7 @@ class Config:
                     if value is not None:
                         parser[section][key] = str(value)
 
-            self.logger.debug(f"Writing config to: {config_path}")
+            self.logger.debug("Writing config to: %s", config_path)
             with open(config_path, "w") as f:
                 parser.write(f)
 
@@ -41,6 +41,7 @@ class TextElement(DocumentElement):
     content: str
     level: Optional[int] = None  # For headings (1-6)
     is_list_item: bool = False
+    indent: int = 0  # Leading spaces of nested list items
 
 
 class TableElement(DocumentElement):
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from pydantic import BaseModel, Field
+from xdg_base_dirs import xdg_cache_home
 
 
 class MistralConfig(BaseModel):
@@ -12,6 +13,7 @@ class MistralConfig(BaseModel):
     batch_size: int = Field(default=5, ge=1, le=20)
     max_retries: int = Field(default=3, ge=0, le=10)
     timeout: int = Field(default=60, ge=10, le=300)
+    requests_per_second: float = Field(default=5.0, gt=0, le=100)
 
 
 class AppConfig(BaseModel):
@@ -19,6 +21,10 @@ class AppConfig(BaseModel):
 
     output_dir: str = "./output"
     log_level: str = "ERROR"
+    cache_dir: str = Field(
+        default_factory=lambda: str(xdg_cache_home() / "intake-document")
+    )
+    document_cache_size: int = Field(default=256, ge=1)
 
 
 class Settings(BaseModel):
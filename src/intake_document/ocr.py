@@ -1,16 +1,34 @@
 """Integration with Mistral.ai OCR API."""
 
-import base64
-import json
 import logging
+import posixpath
+import random
+import re
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlsplit
 
+import httpx
 from mistralai import Mistral
-from mistralai.client import MistralClient
-from PIL import Image
+from mistralai.models import HTTPValidationError, SDKError
+from pydantic import SerializeAsAny, TypeAdapter
+from pydantic_core import from_json
 
 from intake_document.config import config
 from intake_document.models.document import (
@@ -24,6 +42,273 @@ from intake_document.models.document import (
 )
 from intake_document.models.upload_file import UploadFileOut
 from intake_document.utils.exceptions import APIError, OCRError
+from intake_document.utils.file_utils import atomic_write_bytes
+from intake_document.utils.rate_limiter import RateLimiter
+
+# OCR-specific model used for every request
+OCR_MODEL = "mistral-ocr-latest"
+
+# Bump when parsing or rendering changes, so cached OCR results are
+# re-extracted and previously converted files are converted again
+CACHE_VERSION = "v4"
+
+# MIME types for supported document extensions
+_MIME_TYPES: Dict[str, str] = {
+    ".pdf": "application/pdf",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".tiff": "image/tiff",
+    ".tif": "image/tiff",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Image formats converted to PDF before upload
+_PDF_CONVERTED_SUFFIXES = frozenset({".png", ".jpg", ".jpeg"})
+
+# Line patterns for splitting OCR markdown into elements
+_NUM_LIST_RE = re.compile(r"^\d+[.)]\s+(.+)$")
+_THEMATIC_BREAK_RE = re.compile(r"([-*_])(?:[ \t]*\1){2,}")
+_TABLE_SEP_DELETE = str.maketrans("", "", "-:| \t")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)\s]*)\)")
+_TABLE_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+
+# Opening markers of blocks whose lines are kept verbatim
+_FENCE_STARTS = ("```", "~~~", "$$")
+
+
+def _block_fence(line: str) -> Optional[str]:
+    """Find the closing marker of a fenced code or math block.
+
+    Args:
+        line: Stripped line that may open a block
+
+    Returns:
+        Optional[str]: Marker closing the block, or None if the line does
+            not open one
+    """
+    if not line.startswith(_FENCE_STARTS):
+        return None
+    if line[0] == "$":
+        return "$$"
+    return line[: len(line) - len(line.lstrip(line[0]))]
+
+
+def _closes_block(line: str, fence: str) -> bool:
+    """Check whether a line closes a fenced code or math block.
+
+    Args:
+        line: Stripped line inside the block
+        fence: Closing marker returned by ``_block_fence``
+
+    Returns:
+        bool: True if the line ends the block
+    """
+    if fence == "$$":
+        return line.endswith("$$")
+    return line.startswith(fence) and not line.lstrip(fence[0])
+
+
+def _indent_width(line: str) -> int:
+    """Measure the leading indentation of a raw line.
+
+    Args:
+        line: Unstripped line
+
+    Returns:
+        int: Number of leading spaces, counting a tab as four
+    """
+    return len(line[: len(line) - len(line.lstrip())].expandtabs(4))
+
+
+def _split_table_row(line: str) -> List[str]:
+    """Split a pipe-wrapped table row into cells.
+
+    Escaped pipes stay inside their cell and are unescaped.
+
+    Args:
+        line: Stripped line starting and ending with ``|``
+
+    Returns:
+        List[str]: Stripped cell contents
+    """
+    inner = line[1:-1]
+    if "\\|" not in inner:
+        return [cell.strip() for cell in inner.split("|")]
+    return [
+        cell.strip().replace("\\|", "|")
+        for cell in _TABLE_CELL_SPLIT_RE.split(inner)
+    ]
+
+
+def _image_element(match: "re.Match[str]", index: int) -> ImageElement:
+    """Build an image element from a markdown image match.
+
+    Args:
+        match: Match of ``_IMAGE_RE``
+        index: Element index to assign
+
+    Returns:
+        ImageElement: The image element
+    """
+    image_path = urlsplit(match.group(2)).path
+    return ImageElement(
+        element_index=index,
+        image_id=posixpath.splitext(posixpath.basename(image_path))[0],
+        caption=match.group(1) or None,
+    )
+
+
+def _try_heading(line: str, index: int) -> Optional[DocumentElement]:
+    """Match a markdown heading line.
+
+    Args:
+        line: Stripped line starting with ``#``
+        index: Element index to assign
+
+    Returns:
+        Optional[DocumentElement]: Heading element, or None if not a heading
+    """
+    level = len(line) - len(line.lstrip("#"))
+    if not 1 <= level <= 6 or not line[level : level + 1].isspace():
+        return None
+    return TextElement(
+        element_index=index, content=line[level + 1 :].strip(), level=level
+    )
+
+
+def _try_list_item(line: str, index: int) -> Optional[DocumentElement]:
+    """Match a bulleted list item line.
+
+    Args:
+        line: Stripped line starting with ``-``, ``*`` or ``+``
+        index: Element index to assign
+
+    Returns:
+        Optional[DocumentElement]: List item element, or None if not a list
+            item
+    """
+    if not line[1:2].isspace():
+        return None
+    return TextElement(
+        element_index=index, content=line[2:].strip(), is_list_item=True
+    )
+
+
+def _try_numbered_item(line: str, index: int) -> Optional[DocumentElement]:
+    """Match a numbered list item line.
+
+    Numbered items keep their marker and become standalone paragraphs.
+
+    Args:
+        line: Stripped line starting with a digit
+        index: Element index to assign
+
+    Returns:
+        Optional[DocumentElement]: Paragraph element, or None if not numbered
+    """
+    if _NUM_LIST_RE.match(line) is None:
+        return None
+    return TextElement(element_index=index, content=line)
+
+
+# First character of a line -> matcher for the only element it can start
+_LINE_MATCHERS: Dict[str, Callable[[str, int], Optional[DocumentElement]]] = {
+    "#": _try_heading,
+    "-": _try_list_item,
+    "*": _try_list_item,
+    "+": _try_list_item,
+    **{digit: _try_numbered_item for digit in "0123456789"},
+}
+
+# Element type -> model class, for restoring cached elements
+_ELEMENT_CLASSES: Dict[str, Type[DocumentElement]] = {
+    ElementType.TEXT.value: TextElement,
+    ElementType.TABLE.value: TableElement,
+    ElementType.IMAGE.value: ImageElement,
+}
+
+# Serializes each element with its subclass fields, in pydantic's JSON core
+_ELEMENT_LIST = TypeAdapter(List[SerializeAsAny[DocumentElement]])
+
+
+def _dump_elements(elements: List[DocumentElement]) -> bytes:
+    """Serialize document elements for the OCR cache.
+
+    Args:
+        elements: Document elements to serialize
+
+    Returns:
+        bytes: UTF-8 JSON array of element fields
+    """
+    return _ELEMENT_LIST.dump_json(elements)
+
+
+def _load_elements(data: bytes) -> List[DocumentElement]:
+    """Restore document elements serialized by ``_dump_elements``.
+
+    Args:
+        data: UTF-8 JSON array of element fields
+
+    Returns:
+        List[DocumentElement]: The restored document elements
+
+    Raises:
+        ValueError: If the data is not a valid element list
+    """
+    try:
+        return [
+            _ELEMENT_CLASSES[fields["element_type"]].model_validate(fields)
+            for fields in from_json(data)
+        ]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cached element: {e}") from e
+
+
+# Exceptions that mean the API call itself failed: error responses from
+# the SDK, and connection failures or timeouts from its HTTP transport
+_API_ERRORS = (SDKError, HTTPValidationError, httpx.HTTPError)
+
+# Backoff between API retries, in seconds
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+T = TypeVar("T")
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """Check whether an API error is transient and worth retrying.
+
+    Args:
+        error: The exception raised by the API call
+
+    Returns:
+        bool: True for rate limits, server errors, timeouts and connection
+            failures
+    """
+    if isinstance(error, SDKError):
+        return error.status_code == 429 or error.status_code >= 500
+    # Timeouts and connection failures from the SDK's HTTP transport
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Read the server's requested retry delay from an API error.
+
+    Args:
+        error: The exception raised by the API call
+
+    Returns:
+        Optional[float]: Seconds from a numeric ``Retry-After`` header, or
+            None if the error carries no usable header
+    """
+    response = getattr(error, "raw_response", None)
+    if response is None:
+        return None
+    try:
+        return max(0.0, float(response.headers.get("retry-after", "")))
+    except ValueError:
+        return None
 
 
 class MistralOCR:
@@ -41,16 +326,41 @@ class MistralOCR:
                 "or configure it in the config file."
             )
 
-        # Initialize client (will be None if no API key)
-        self.client = Mistral(api_key=self.api_key) if self.api_key else None
+        # Client is created on first use and shared across documents; the
+        # lock keeps concurrent batch workers from each building one
+        self._client: Optional[Mistral] = None
+        self._client_lock = threading.Lock()
 
         # OCR configuration
-        self.model = (
-            "mistral-ocr-latest"  # Use the OCR-specific model
-        )
+        self.model = OCR_MODEL
         self.batch_size = config.settings.mistral.batch_size
         self.max_retries = config.settings.mistral.max_retries
         self.timeout = config.settings.mistral.timeout
+        self.limiter = RateLimiter(config.settings.mistral.requests_per_second)
+
+        # On-disk cache of OCR results keyed by document checksum
+        cache_root = Path(config.settings.app.cache_dir).expanduser()
+        self.cache_dir = cache_root / "ocr"
+
+    @property
+    def client(self) -> Optional[Mistral]:
+        """Mistral client, created on first use.
+
+        Building the client lazily keeps commands that never reach the API
+        from paying for it, and a single client reuses its HTTP connection
+        pool for every document.
+
+        Returns:
+            Optional[Mistral]: The shared client, or None if no API key is
+                configured
+        """
+        if self._client is None and self.api_key:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = Mistral(
+                        api_key=self.api_key, timeout_ms=self.timeout * 1000
+                    )
+        return self._client
 
     def process_document(
         self, document_instance: DocumentInstance
@@ -70,19 +380,23 @@ class MistralOCR:
         # Check if client is initialized
         if self.client is None:
             error_msg = "Mistral client not initialized"
-            self.logger.error(f"{error_msg}. Please provide an API key.")
+            self.logger.error("%s. Please provide an API key.", error_msg)
             raise OCRError(
                 error_msg,
                 detail="Set MISTRAL_API_KEY environment variable or configure it in the config file.",
             )
 
         self.logger.debug(
-            f"Processing {document_instance.file_type.value}: {document_instance.path.name}"
+            "Processing %s: %s",
+            document_instance.file_type.value,
+            document_instance.path.name,
         )
 
         try:
             # Process document with OCR API
-            elements = self._process_with_ocr_api(document_instance.path)
+            elements = self._process_with_ocr_api(
+                document_instance.path, document_instance.checksum
+            )
 
             # Create processed document
             document = Document(
@@ -93,21 +407,80 @@ class MistralOCR:
 
             return document
 
-        except APIError:
-            # Re-raise API errors directly
-            raise
-        except Exception as e:
+        except (OSError, ValueError) as e:
+            # API failures arrive already classified and logged as
+            # APIError or OCRError; only wrap cache and model errors here
             error_msg = (
                 f"Error processing document with OCR: {document_instance.path}"
             )
-            self.logger.error(f"{error_msg}: {str(e)}")
-            raise OCRError(error_msg, detail=str(e))
+            self.logger.error("%s: %s", error_msg, e)
+            raise OCRError(error_msg, detail=str(e)) from e
+
+    def iter_documents(
+        self, document_instances: List[DocumentInstance]
+    ) -> Iterator[Tuple[DocumentInstance, Union[Document, Exception]]]:
+        """Process documents concurrently, yielding each as it completes.
+
+        At most ``batch_size`` documents are in flight at once. Callers can
+        handle each result while the remaining documents are still being
+        processed; a document that fails yields its exception in place of
+        a Document. Closing the iterator early cancels the documents that
+        have not started yet.
+
+        Args:
+            document_instances: The document instances to process
+
+        Yields:
+            Tuple[DocumentInstance, Union[Document, Exception]]: Each
+                instance with its processed document or raised exception,
+                in completion order
+        """
+        if not document_instances:
+            return
+
+        self.logger.debug(
+            "Processing %d documents with up to %d concurrent requests",
+            len(document_instances),
+            self.batch_size,
+        )
 
-    def _process_with_ocr_api(self, file_path: Path) -> List[DocumentElement]:
+        # The pipeline is blocking I/O, so overlap it on a dedicated pool
+        # sized to the batch; the default executor may have fewer threads,
+        # and small batches need no more threads than documents
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.batch_size, len(document_instances)),
+            thread_name_prefix="ocr",
+        )
+        try:
+            futures = {
+                executor.submit(self.process_document, instance): instance
+                for instance in document_instances
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                yield (
+                    futures[future],
+                    (
+                        error
+                        if isinstance(error, Exception)
+                        else future.result()
+                    ),
+                )
+        finally:
+            # A caller that stops early leaves queued documents unstarted
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _process_with_ocr_api(
+        self, file_path: Path, checksum: str
+    ) -> List[DocumentElement]:
         """Process document using Mistral OCR API.
 
+        Results are cached on disk by content checksum, so a document that
+        has been processed before is not sent to the API again.
+
         Args:
             file_path: Path to the document file
+            checksum: SHA-512 checksum of the document content
 
         Returns:
             List[DocumentElement]: List of extracted document elements
@@ -116,8 +489,35 @@ class MistralOCR:
             APIError: If the OCR API call fails
             OCRError: If document processing fails for other reasons
         """
-        self.logger.debug(f"Processing document with OCR API: {file_path}")
-        
+        self.logger.debug("Processing document with OCR API: %s", file_path)
+
+        cache_key = f"{checksum}_{self.model}_{CACHE_VERSION}"
+        elements = self._load_cached_elements(cache_key)
+
+        if elements is None:
+            text = self._fetch_ocr_text(file_path)
+            elements = self._parse_ocr_text(text)
+            self._save_cached_elements(cache_key, text, elements)
+        else:
+            self.logger.info("Using cached OCR result for %s", file_path.name)
+
+        self.logger.debug("Extracted %d document elements", len(elements))
+
+        return elements
+
+    def _fetch_ocr_text(self, file_path: Path) -> str:
+        """Upload a document and run it through the OCR API.
+
+        Args:
+            file_path: Path to the document file
+
+        Returns:
+            str: The markdown text returned by the OCR API
+
+        Raises:
+            APIError: If the OCR API call fails
+            OCRError: If document processing fails for other reasons
+        """
         temp_file = None
         
         try:
@@ -131,15 +531,74 @@ class MistralOCR:
             self._save_upload_info(upload_info, file_path)
             
             # Perform OCR using the signed URL
-            elements = self._perform_ocr(upload_info.signed_url)
-            
-            return elements
+            return self._perform_ocr(upload_info.signed_url)
             
         except Exception as e:
             self._handle_ocr_error(e, file_path)
         finally:
             self._cleanup_temp_file(temp_file)
 
+    def _load_cached_elements(
+        self, cache_key: str
+    ) -> Optional[List[DocumentElement]]:
+        """Load previously extracted document elements from the cache.
+
+        Falls back to re-parsing the cached OCR text when the parsed
+        elements are missing.
+
+        Args:
+            cache_key: Cache key identifying the document content
+
+        Returns:
+            Optional[List[DocumentElement]]: Cached document elements, or
+                None on a cache miss
+        """
+        elements_path = self.cache_dir / f"{cache_key}.json"
+        text_path = self.cache_dir / f"{cache_key}.md"
+
+        try:
+            if elements_path.exists():
+                return _load_elements(elements_path.read_bytes())
+
+            if text_path.exists():
+                text = text_path.read_text(encoding="utf-8")
+                elements = self._parse_ocr_text(text)
+                atomic_write_bytes(elements_path, _dump_elements(elements))
+                return elements
+
+        except (OSError, ValueError) as e:
+            self.logger.warning(
+                "Ignoring unreadable OCR cache entry %s: %s", cache_key, e
+            )
+
+        return None
+
+    def _save_cached_elements(
+        self,
+        cache_key: str,
+        text: str,
+        elements: List[DocumentElement],
+    ) -> None:
+        """Store OCR text and its parsed elements in the cache.
+
+        Args:
+            cache_key: Cache key identifying the document content
+            text: The markdown text returned by the OCR API
+            elements: Document elements parsed from the text
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(
+                self.cache_dir / f"{cache_key}.md", text.encode("utf-8")
+            )
+            atomic_write_bytes(
+                self.cache_dir / f"{cache_key}.json", _dump_elements(elements)
+            )
+            self.logger.debug("Cached OCR result as %s", cache_key)
+        except OSError as e:
+            self.logger.warning(
+                "Failed to write OCR cache entry %s: %s", cache_key, e
+            )
 
     def _prepare_file_for_upload(self, file_path: Path) -> tuple[Path, tempfile._TemporaryFileWrapper]:
         """Prepare file for upload, converting if necessary.
@@ -151,19 +610,22 @@ class MistralOCR:
             tuple: (Path to file to upload, Temporary file if created or None)
         """
         # Check if we need to convert the file
-        if file_path.suffix.lower() in ['.png', '.jpg', '.jpeg']:
-            self.logger.info(f"Converting image file to PDF: {file_path}")
+        if file_path.suffix.lower() in _PDF_CONVERTED_SUFFIXES:
+            self.logger.info("Converting image file to PDF: %s", file_path)
             # Create a temporary PDF file
             temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
             temp_file.close()
             
+            # Pillow is only needed for images, so load it on first use
+            from PIL import Image
+
             # Convert image to PDF
             img = Image.open(file_path)
             img.save(temp_file.name, 'PDF', resolution=100.0)
             
             # Use the temporary file for processing
             file_to_upload = Path(temp_file.name)
-            self.logger.debug(f"Image converted to PDF: {file_to_upload}")
+            self.logger.debug("Image converted to PDF: %s", file_to_upload)
             return file_to_upload, temp_file
         
         return file_path, None
@@ -179,16 +641,23 @@ class MistralOCR:
             UploadFileOut: Upload information including signed URL
         """
         # Step 1: Upload the file to Mistral server
-        self.logger.debug(f"Uploading file to Mistral server: {file_to_upload}")
-        
-        uploaded_file = self.client.files.upload(
-            file={
-                "file_name": file_to_upload.name,
-                "content": open(file_to_upload, "rb"),
-            },
-            purpose="ocr"
+        self.logger.debug(
+            "Uploading file to Mistral server: %s", file_to_upload
         )
         
+        def upload() -> Any:
+            # Reopen per attempt so a retry uploads the whole file again
+            with open(file_to_upload, "rb") as content:
+                return self.client.files.upload(
+                    file={
+                        "file_name": file_to_upload.name,
+                        "content": content,
+                    },
+                    purpose="ocr",
+                )
+
+        uploaded_file = self._call_with_retry(upload)
+        
         # Get file data from upload response
         file_data = uploaded_file.model_dump()
         
@@ -196,11 +665,17 @@ class MistralOCR:
         if "size_bytes" not in file_data or file_data["size_bytes"] is None:
             file_size = file_to_upload.stat().st_size
             file_data["size_bytes"] = file_size
-            self.logger.debug(f"Using file size as fallback: {file_size} bytes")
+            self.logger.debug(
+                "Using file size as fallback: %d bytes", file_size
+            )
         
         # Step 2: Get the signed URL of the uploaded file
-        self.logger.debug(f"Getting signed URL for uploaded file: {uploaded_file.id}")
-        signed_url_response = self.client.files.get_signed_url(file_id=uploaded_file.id)
+        self.logger.debug(
+            "Getting signed URL for uploaded file: %s", uploaded_file.id
+        )
+        signed_url_response = self._call_with_retry(
+            self.client.files.get_signed_url, file_id=uploaded_file.id
+        )
         
         # Add signed URL to the upload file info
         file_data["signed_url"] = signed_url_response.url
@@ -222,35 +697,78 @@ class MistralOCR:
         with open(json_file_path, "w") as f:
             f.write(upload_info.as_json())
         
-        self.logger.info(f"Saved file upload info to: {json_file_path}")
+        self.logger.info("Saved file upload info to: %s", json_file_path)
     
-    def _perform_ocr(self, signed_url: str) -> List[DocumentElement]:
+    def _perform_ocr(self, signed_url: str) -> str:
         """Perform OCR using the signed URL.
         
         Args:
             signed_url: The signed URL to access the file
             
         Returns:
-            List[DocumentElement]: Extracted document elements
+            str: The markdown text of all pages
         """
         self.logger.debug("Calling Mistral OCR API with signed URL")
         
-        with Mistral(api_key=self.api_key) as mistral:
-            ocr_response = mistral.ocr.process(
-                model="mistral-ocr-latest",
-                document={
-                    "document_url": signed_url,
-                    "type": "document_url"
-                },
-                include_image_base64=True
-            )
+        ocr_response = self._call_with_retry(
+            self.client.ocr.process,
+            model=self.model,
+            document={
+                "document_url": signed_url,
+                "type": "document_url"
+            },
+            # Images are referenced by id only, so skip their base64 payloads
+            include_image_base64=False
+        )
 
-        # Parse the OCR response into document elements
-        elements = self._parse_ocr_response(ocr_response)
-        self.logger.debug(f"Extracted {len(elements)} document elements")
-        
-        return elements
+        return self._get_ocr_text(ocr_response)
     
+    def _call_with_retry(
+        self, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Call an API function, retrying transient failures.
+
+        Each attempt waits for the shared rate limiter first. Rate limits,
+        server errors, timeouts and connection errors are retried up to
+        ``max_retries`` times with exponential backoff and jitter, waiting
+        at least as long as a ``Retry-After`` header asks for (up to
+        ``RETRY_MAX_DELAY``). Any other error is raised immediately.
+
+        Args:
+            fn: The API function to call
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            T: The return value of ``fn``
+        """
+        attempt = 0
+        while True:
+            # Wait for a slot on every attempt, including retries
+            self.limiter.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable_error(e):
+                    raise
+
+                delay = min(
+                    RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt
+                ) + random.uniform(0, RETRY_BASE_DELAY)
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, RETRY_MAX_DELAY))
+                attempt += 1
+                self.logger.warning(
+                    "Transient API error (%s), retrying in %.1fs "
+                    "(attempt %d/%d)",
+                    e,
+                    delay,
+                    attempt,
+                    self.max_retries,
+                )
+                time.sleep(delay)
+
     def _handle_ocr_error(self, exception: Exception, file_path: Path) -> None:
         """Handle OCR processing errors.
         
@@ -263,18 +781,12 @@ class MistralOCR:
             OCRError: For other types of errors
         """
         error_msg = f"Failed to process document with OCR API: {file_path}"
-        self.logger.error(f"{error_msg}: {str(exception)}")
+        self.logger.error("%s: %s", error_msg, exception)
         
-        # Determine if it's an API error or another type of error
-        if (
-            "ConnectionError" in str(exception)
-            or "Timeout" in str(exception)
-            or "Status code" in str(exception)
-            or "API" in str(exception)
-        ):
-            raise APIError(error_msg, detail=str(exception))
-        else:
-            raise OCRError(error_msg, detail=str(exception))
+        # Errors raised by the SDK or its HTTP transport are API errors
+        if isinstance(exception, _API_ERRORS):
+            raise APIError(error_msg, detail=str(exception)) from exception
+        raise OCRError(error_msg, detail=str(exception)) from exception
     
     def _cleanup_temp_file(self, temp_file) -> None:
         """Clean up temporary file if it exists.
@@ -285,9 +797,11 @@ class MistralOCR:
         if temp_file and Path(temp_file.name).exists():
             try:
                 Path(temp_file.name).unlink()
-                self.logger.debug(f"Temporary file deleted: {temp_file.name}")
-            except Exception as e:
-                self.logger.warning(f"Failed to delete temporary file {temp_file.name}: {str(e)}")
+                self.logger.debug("Temporary file deleted: %s", temp_file.name)
+            except OSError as e:
+                self.logger.warning(
+                    "Failed to delete temporary file %s: %s", temp_file.name, e
+                )
     
     def _get_mime_type(self, file_path: Path) -> str:
         """Get MIME type for file extension.
@@ -298,62 +812,278 @@ class MistralOCR:
         Returns:
             str: MIME type string
         """
-        mime_types = {
-            ".pdf": "application/pdf",
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".tiff": "image/tiff",
-            ".tif": "image/tiff",
-            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        }
-        return mime_types.get(
+        return _MIME_TYPES.get(
             file_path.suffix.lower(), "application/octet-stream"
         )
 
 
 
-    def _parse_ocr_response(self, ocr_response) -> List[DocumentElement]:
-        """Parse the Mistral OCR response into document elements.
+    def _get_ocr_text(self, ocr_response) -> str:
+        """Get the markdown text from a Mistral OCR response.
 
         Args:
             ocr_response: The OCR API response object
 
+        Returns:
+            str: The markdown text of the response
+        """
+        # mistral-ocr-latest returns one markdown body per page
+        if hasattr(ocr_response, "pages"):
+            return "\n\n".join(page.markdown for page in ocr_response.pages)
+        elif hasattr(ocr_response, "content"):
+            return ocr_response.content
+        elif hasattr(ocr_response, "text"):
+            return ocr_response.text
+        elif isinstance(ocr_response, dict):
+            return ocr_response.get("content") or ocr_response.get("text", "")
+        else:
+            return str(ocr_response)
+
+    def _parse_ocr_text(self, content: str) -> List[DocumentElement]:
+        """Parse OCR markdown text into document elements.
+
+        Args:
+            content: The markdown text returned by the OCR API
+
         Returns:
             List[DocumentElement]: List of parsed document elements
         """
-        self.logger.debug("Parsing OCR response into document elements")
+        self.logger.debug("Parsing OCR text into document elements")
+
+        try:
+            if not content or not content.strip():
+                self.logger.debug("OCR response contained no content")
+                return []
+
+            elements = self._extract_elements_from_text(content)
+            self.logger.debug(
+                "Parsed OCR text into %d elements", len(elements)
+            )
+            return elements
+
+        except ValueError as e:
+            self.logger.warning("Failed to parse OCR response: %s", e)
+            # Return empty list if parsing fails
+            return []
+
+    def _extract_elements_from_text(self, text: str) -> List[DocumentElement]:
+        """Split markdown text into document elements.
+
+        Recognizes headings, bulleted and numbered list items, thematic
+        breaks, tables, images and paragraphs. Consecutive text lines are
+        joined into a single paragraph; block quote lines keep their line
+        breaks, list items keep their indentation, and fenced code,
+        indented code and ``$$`` math blocks are kept verbatim.
+
+        Args:
+            text: Markdown text returned by the OCR API
+
+        Returns:
+            List[DocumentElement]: Document elements in reading order;
+                empty if the text holds only whitespace
+        """
+        self.logger.debug(
+            "Extracting elements from text of length %d", len(text)
+        )
 
         elements: List[DocumentElement] = []
+        current_parts: List[str] = []
+        # Bound once, as these run for every line, element and table row
+        add_element = elements.append
+        add_part = current_parts.append
+        in_table = False
+        # True until the row following a table's header has been read
+        after_header = False
+        table_headers: List[str] = []
+        table_rows: List[List[str]] = []
+        add_row = table_rows.append
+        # Paragraph lines are joined with spaces, quote lines with newlines
+        joiner = " "
+        # Closing marker and raw lines of an open fenced block
+        fence: Optional[str] = None
+        block_lines: List[str] = []
+        # Raw lines of an open indented code block
+        code_lines: List[str] = []
+        previous_blank = True
 
-        # The OCR response structure may vary, so we need to adapt based on
-        # the actual response format from mistral-ocr-latest
-        try:
-            # Try to access the content from the OCR response
-            if hasattr(ocr_response, 'content'):
-                content = ocr_response.content
-            elif hasattr(ocr_response, 'text'):
-                content = ocr_response.text
-            elif isinstance(ocr_response, dict):
-                content = ocr_response.get('content') or ocr_response.get('text', '')
-            else:
-                content = str(ocr_response)
-
-            # For now, create a simple text element with the extracted content
-            # This can be enhanced later to parse structured content
-            if content:
-                elements.append(
+        def flush_paragraph() -> None:
+            if current_parts:
+                add_element(
                     TextElement(
-                        element_type=ElementType.TEXT,
-                        element_index=0,
-                        content=content.strip(),
+                        element_index=len(elements),
+                        content=joiner.join(current_parts),
                     )
                 )
+                current_parts.clear()
 
-            self.logger.debug(f"Parsed OCR response into {len(elements)} elements")
-            return elements
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            after_blank, previous_blank = previous_blank, not line
 
-        except Exception as e:
-            self.logger.warning(f"Failed to parse OCR response: {str(e)}")
-            # Return empty list if parsing fails
-            return []
+            # Fenced blocks keep every line as is until their closing fence
+            if fence is not None:
+                block_lines.append(raw_line)
+                if _closes_block(line, fence):
+                    add_element(
+                        TextElement(
+                            element_index=len(elements),
+                            content="\n".join(block_lines),
+                        )
+                    )
+                    fence = None
+                continue
+
+            # Indented code blocks run until a line that is not indented
+            if code_lines:
+                if line and _indent_width(raw_line) >= 4:
+                    code_lines.append(raw_line)
+                    continue
+                add_element(
+                    TextElement(
+                        element_index=len(elements),
+                        content="\n".join(code_lines),
+                    )
+                )
+                code_lines.clear()
+
+            # Table rows are wrapped in pipes and start or continue a table
+            if len(line) > 2 and line[0] == "|" and line[-1] == "|":
+                flush_paragraph()
+
+                if not in_table:
+                    in_table = True
+                    after_header = True
+                    table_headers = _split_table_row(line)
+                    table_rows = []
+                    add_row = table_rows.append
+                    continue
+
+                # The separator row under the header holds only pipes,
+                # dashes and colons; later rows like it are data
+                if not after_header or line.translate(_TABLE_SEP_DELETE):
+                    add_row(_split_table_row(line))
+                after_header = False
+                continue
+
+            # Any other line closes an open table
+            if in_table:
+                add_element(
+                    TableElement(
+                        element_index=len(elements),
+                        headers=table_headers,
+                        rows=table_rows,
+                    )
+                )
+                in_table = False
+
+            # Blank lines end the current paragraph
+            if not line:
+                flush_paragraph()
+                continue
+
+            # Code and math fences open a verbatim block; a one-line
+            # ``$$...$$`` block closes on the same line
+            block_fence = _block_fence(line)
+            if block_fence is not None:
+                flush_paragraph()
+                block_lines = [raw_line]
+                if block_fence == "$$" and _closes_block(line[2:], "$$"):
+                    add_element(
+                        TextElement(
+                            element_index=len(elements), content=raw_line
+                        )
+                    )
+                else:
+                    fence = block_fence
+                continue
+
+            # Thematic breaks such as ``* * *`` are kept before they can
+            # be taken for list items
+            if line[0] in "-*_" and _THEMATIC_BREAK_RE.fullmatch(line):
+                flush_paragraph()
+                add_element(
+                    TextElement(element_index=len(elements), content=line)
+                )
+                continue
+
+            indent = _indent_width(raw_line) if raw_line[0] in " \t" else 0
+
+            # The first character decides which pattern can apply; a
+            # pending paragraph is flushed first and takes the next index
+            try_match = _LINE_MATCHERS.get(line[0])
+            element = (
+                try_match(line, len(elements) + bool(current_parts))
+                if try_match
+                else None
+            )
+            if element is not None:
+                flush_paragraph()
+                # List items keep their nesting; headings do not nest
+                if (
+                    indent
+                    and isinstance(element, TextElement)
+                    and element.level is None
+                ):
+                    element.indent = indent
+                add_element(element)
+                continue
+
+            # Indented lines after a blank line open a verbatim code block
+            if indent >= 4 and after_blank:
+                code_lines.append(raw_line)
+                continue
+
+            # A line starting with an image, such as a figure and its
+            # caption, is split into its images and the text between
+            # them; text after the last image starts a paragraph
+            if line[0] == "!" and _IMAGE_RE.match(line) is not None:
+                flush_paragraph()
+                end = 0
+                for match in _IMAGE_RE.finditer(line):
+                    between = line[end : match.start()].strip()
+                    if between:
+                        add_element(
+                            TextElement(
+                                element_index=len(elements), content=between
+                            )
+                        )
+                    add_element(_image_element(match, len(elements)))
+                    end = match.end()
+                line = line[end:].lstrip()
+                if not line:
+                    continue
+
+            # Plain text continues the current paragraph, unless it
+            # switches between quote and non-quote lines
+            line_joiner = "\n" if line[0] == ">" else " "
+            if line_joiner != joiner:
+                flush_paragraph()
+                joiner = line_joiner
+            add_part(line)
+
+        # Flush whatever is still open at the end of the text
+        if fence is not None:
+            add_element(
+                TextElement(
+                    element_index=len(elements),
+                    content="\n".join(block_lines),
+                )
+            )
+        if code_lines:
+            add_element(
+                TextElement(
+                    element_index=len(elements),
+                    content="\n".join(code_lines),
+                )
+            )
+        if in_table:
+            add_element(
+                TableElement(
+                    element_index=len(elements),
+                    headers=table_headers,
+                    rows=table_rows,
+                )
+            )
+        flush_paragraph()
+
+        return elements
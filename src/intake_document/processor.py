@@ -1,31 +1,83 @@
 """Document processing functionality."""
 
+import json
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 # Local application imports
 from intake_document.config import config
 from intake_document.models.document import (
     Document,
     DocumentInstance,
+    DocumentType,
 )
-from intake_document.ocr import MistralOCR
+from intake_document.ocr import CACHE_VERSION, OCR_MODEL, MistralOCR
 from intake_document.renderer import MarkdownRenderer
-from intake_document.utils.exceptions import DocumentError, FileTypeError
+from intake_document.utils.exceptions import (
+    DocumentError,
+    FileError,
+    FileTypeError,
+    IntakeDocumentError,
+)
 from intake_document.utils.file_utils import (
+    atomic_write_bytes,
     calculate_sha512,
+    get_document_type,
     get_file_metadata,
     validate_file,
 )
 
 
+def _index_entry(
+    file_stat: os.stat_result, output_path: Path
+) -> Dict[str, Any]:
+    """Describe a converted source file for the processed index.
+
+    Args:
+        file_stat: Stat result of the source file when it was read
+        output_path: Path to the markdown output written for it
+
+    Returns:
+        Dict[str, Any]: Entry matching only while neither file changes
+            and the OCR model and cache version stay the same
+
+    Raises:
+        OSError: If the output file cannot be accessed
+    """
+    return {
+        "size": file_stat.st_size,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "output": str(output_path.resolve()),
+        "output_mtime_ns": output_path.stat().st_mtime_ns,
+        "ocr_model": OCR_MODEL,
+        "cache_version": CACHE_VERSION,
+    }
+
+
 class DocumentProcessor:
     """Handles processing of documents through OCR and conversion."""
 
-    def __init__(self) -> None:
+    def __init__(self, force: bool = False) -> None:
         """Initialize the document processor.
 
+        Args:
+            force: Convert every file again, even if it is unchanged since
+                an earlier run
+
         Raises:
             DocumentError: If the output directory cannot be created
         """
@@ -35,23 +87,35 @@ class DocumentProcessor:
         self.ocr = MistralOCR()
         self.renderer = MarkdownRenderer()
 
-        # Cache for processed documents to avoid reprocessing
-        self._processed_documents: Dict[str, Document] = {}
+        # Recently processed documents by checksum, to avoid reprocessing;
+        # older ones fall back to the OCR cache on disk
+        self._processed_documents: OrderedDict[str, Document] = OrderedDict()
+        self._cache_max = config.settings.app.document_cache_size
+
+        # Source files converted on earlier runs, keyed by absolute path,
+        # so unchanged files are skipped without rehashing them unless
+        # every file is forced through again
+        self.force = force
+        self._index_path = (
+            Path(config.settings.app.cache_dir).expanduser() / "processed.json"
+        )
+        self._index = self._load_index()
 
         # Ensure output directory exists
         try:
             output_dir = Path(config.settings.app.output_dir)
             self.logger.debug(
-                f"Creating output directory if needed: {output_dir}"
+                "Creating output directory if needed: %s", output_dir
             )
             output_dir.mkdir(parents=True, exist_ok=True)
         except OSError as e:
             error_msg = f"Failed to create output directory: {output_dir}"
-            self.logger.error(f"{error_msg}: {str(e)}")
+            self.logger.error("%s: %s", error_msg, e)
             raise DocumentError(error_msg, detail=str(e))
 
         self.logger.info(
-            f"DocumentProcessor initialized with output directory: {output_dir}"
+            "DocumentProcessor initialized with output directory: %s",
+            output_dir,
         )
 
     def process_file(self, file_path: Path) -> Path:
@@ -65,65 +129,60 @@ class DocumentProcessor:
 
         Raises:
             DocumentError: If the document processing fails
+            FileError: If the file cannot be read
             FileTypeError: If the file type is not supported
-            FileNotFoundError: If the file doesn't exist
+            OCRError: If OCR processing fails
+            APIError: If API communication fails
+            RenderError: If markdown rendering fails
         """
-        self.logger.info(f"Processing file: {file_path}")
+        self.logger.info("Processing file: %s", file_path)
 
         # Validate file and get document type
         try:
             doc_type = validate_file(file_path)
-            self.logger.debug(f"Validated file: {file_path}, type: {doc_type}")
+            self.logger.debug(
+                "Validated file: %s, type: %s", file_path, doc_type
+            )
         except (FileError, FileTypeError) as e:
-            self.logger.error(f"File validation failed: {e.message}")
+            self.logger.error("File validation failed: %s", e.message)
             raise
 
         try:
-            # Create document instance
-            self.logger.debug(f"Creating document instance for: {file_path}")
-            checksum = calculate_sha512(file_path)
-            file_size, last_modified = get_file_metadata(file_path)
-
-            document_instance = DocumentInstance(
-                path=file_path,
-                file_type=doc_type,
-                checksum=checksum,
-                file_size=file_size,
-                last_modified=last_modified,
+            file_stat = file_path.stat()
+            output_path = self._get_unchanged_output(file_path, file_stat)
+            if output_path is not None:
+                self.logger.info("Skipping unchanged file: %s", file_path)
+                return output_path
+
+            document_instance = self._create_document_instance(
+                file_path, doc_type
             )
 
             # Check if we already have processed this document
-            if checksum in self._processed_documents:
-                self.logger.info(f"Using cached result for {file_path.name}")
-                document = self._processed_documents[checksum]
-                document_instance.processed_at = document.processed_at
-            else:
-                # Process with OCR and convert to markdown
+            document = self._get_processed(document_instance.checksum)
+            if document is None:
                 document = self.ocr.process_document(document_instance)
-                document = self.renderer.render_markdown(document)
-
-                # Cache the processed document
-                self._processed_documents[checksum] = document
-                document_instance.processed_at = document.processed_at
-
-                self.logger.info(
-                    f"Processed {file_path.name}: {len(document.elements)} elements, {len(document.markdown or '')} chars markdown"
-                )
-
-            # Save to output file
-            output_path = self._get_output_path(file_path)
-            self._save_markdown(document, output_path)
 
+            output_path = self._finish_document(document_instance, document)
+            self._record_output(file_path, file_stat, output_path)
+            self._save_index()
             return output_path
 
-        except Exception as e:
+        except IntakeDocumentError:
+            # Already logged where it was raised
+            raise
+        except (OSError, ValueError) as e:
             error_msg = f"Failed to process document: {file_path}"
-            self.logger.error(f"{error_msg}: {str(e)}")
-            raise DocumentError(error_msg, detail=str(e))
+            self.logger.error("%s: %s", error_msg, e)
+            raise DocumentError(error_msg, detail=str(e)) from e
 
     def process_directory(self, dir_path: Path) -> List[Path]:
         """Process all supported documents in a directory.
 
+        Files unchanged since an earlier run are skipped. Documents that
+        have not been processed before are sent to the OCR service as one
+        concurrent batch, once per distinct content.
+
         Args:
             dir_path: Path to the directory
 
@@ -133,7 +192,7 @@ class DocumentProcessor:
         Raises:
             DocumentError: If the directory doesn't exist or cannot be read
         """
-        self.logger.info(f"Processing directory: {dir_path}")
+        self.logger.info("Processing directory: %s", dir_path)
 
         # Check if directory exists
         if not dir_path.exists() or not dir_path.is_dir():
@@ -142,61 +201,347 @@ class DocumentProcessor:
             raise DocumentError(error_msg)
 
         try:
-            # List all files in the directory
-            file_count = sum(1 for _ in dir_path.iterdir() if _.is_file())
-            self.logger.debug(f"Found {file_count} files in directory")
+            # List all files in one pass; DirEntry caches the file check
+            with os.scandir(dir_path) as entries:
+                file_paths = [
+                    Path(entry.path) for entry in entries if entry.is_file()
+                ]
+            file_count = len(file_paths)
+            self.logger.debug("Found %d files in directory", file_count)
+            self._prune_index(dir_path, {path.name for path in file_paths})
 
             # Track processing statistics
             stats = {
                 "processed": 0,
+                "unchanged": 0,
                 "skipped": 0,
                 "failed": 0,
                 "total": file_count,
             }
 
-            # Process all supported files
-            output_paths = []
-            for file_path in dir_path.iterdir():
-                if file_path.is_file():
+            # Collect supported files that changed since they were last
+            # converted; listed entries are known to be regular files, so
+            # only the type needs checking
+            supported: List[Tuple[Path, DocumentType]] = []
+            file_stats: Dict[Path, os.stat_result] = {}
+            output_by_path: Dict[Path, Path] = {}
+            for file_path in file_paths:
+                try:
+                    doc_type = get_document_type(file_path)
+                    file_stat = file_stats[file_path] = file_path.stat()
+                except FileTypeError:
+                    self.logger.debug(
+                        "Skipping unsupported file: %s", file_path
+                    )
+                    stats["skipped"] += 1
+                    continue
+                except OSError as e:
+                    stats["failed"] += 1
+                    self.logger.error("Error processing %s: %s", file_path, e)
+                    continue
+
+                output_path = self._get_unchanged_output(file_path, file_stat)
+                if output_path is None:
+                    supported.append((file_path, doc_type))
+                else:
+                    self.logger.debug("Skipping unchanged file: %s", file_path)
+                    output_by_path[file_path] = output_path
+                    stats["unchanged"] += 1
+
+            # Checksum files in parallel; hashlib releases the GIL while
+            # hashing, so threads overlap both disk reads and digests
+            with ThreadPoolExecutor() as executor:
+                futures = [
+                    executor.submit(
+                        self._create_document_instance, file_path, doc_type
+                    )
+                    for file_path, doc_type in supported
+                ]
+
+            instances: List[DocumentInstance] = []
+            for (file_path, _), future in zip(supported, futures, strict=True):
+                try:
+                    instances.append(future.result())
+                except Exception as e:
+                    stats["failed"] += 1
+                    self.logger.error("Error processing %s: %s", file_path, e)
+
+            # Take already processed documents now, so later cache
+            # evictions cannot drop them, and OCR the rest in one batch.
+            # Files sharing content are sent once; their copies are
+            # finished from the same result.
+            finished: List[Tuple[DocumentInstance, Document]] = []
+            pending = []
+            copies: Dict[str, List[DocumentInstance]] = {}
+            for instance in instances:
+                document = self._get_processed(instance.checksum)
+                if document is not None:
+                    finished.append((instance, document))
+                elif instance.checksum in copies:
+                    copies[instance.checksum].append(instance)
+                else:
+                    copies[instance.checksum] = []
+                    pending.append(instance)
+
+            self.logger.debug(
+                "Sending %d of %d documents to OCR",
+                len(pending),
+                len(instances),
+            )
+
+            # Render and save each document as soon as its OCR completes,
+            # while the rest of the batch is still in flight
+            results: Iterable[
+                Tuple[DocumentInstance, Union[Document, Exception]]
+            ] = chain(finished, self.ocr.iter_documents(pending))
+            for first, result in results:
+                for instance in (first, *copies.pop(first.checksum, ())):
                     try:
-                        # Check if file type is supported
-                        try:
-                            validate_file(file_path)
-                        except (FileError, FileTypeError):
-                            self.logger.debug(
-                                f"Skipping unsupported file: {file_path}"
-                            )
-                            stats["skipped"] += 1
-                            continue
-
-                        # Process the file
-                        self.logger.debug(
-                            f"Processing file {stats['processed'] + stats['skipped'] + stats['failed'] + 1}/{file_count}: {file_path}"
+                        if isinstance(result, Exception):
+                            raise result
+                        output_path = self._finish_document(instance, result)
+                        output_by_path[instance.path] = output_path
+                        self._record_output(
+                            instance.path,
+                            file_stats[instance.path],
+                            output_path,
                         )
-                        output_path = self.process_file(file_path)
-                        output_paths.append(output_path)
                         stats["processed"] += 1
 
                     except Exception as e:
                         stats["failed"] += 1
                         self.logger.error(
-                            f"Error processing {file_path}: {str(e)}"
+                            "Error processing %s: %s", instance.path, e
                         )
 
+            self._save_index()
+
+            output_paths = [
+                output_by_path[file_path]
+                for file_path in file_paths
+                if file_path in output_by_path
+            ]
+
             # Log processing summary
             self.logger.info(
-                f"Directory processing complete: "
-                f"{stats['processed']} processed, {stats['skipped']} skipped, "
-                f"{stats['failed']} failed, {stats['total']} total"
+                "Directory processing complete: %d processed, "
+                "%d unchanged, %d skipped, %d failed, %d total",
+                stats["processed"],
+                stats["unchanged"],
+                stats["skipped"],
+                stats["failed"],
+                stats["total"],
             )
 
             return output_paths
 
         except OSError as e:
             error_msg = f"Error reading directory: {dir_path}"
-            self.logger.error(f"{error_msg}: {str(e)}")
+            self.logger.error("%s: %s", error_msg, e)
             raise DocumentError(error_msg, detail=str(e))
 
+    def _create_document_instance(
+        self, file_path: Path, doc_type: DocumentType
+    ) -> DocumentInstance:
+        """Create a document instance for a validated file.
+
+        Args:
+            file_path: Path to the document file
+            doc_type: The validated document type
+
+        Returns:
+            DocumentInstance: The document instance with checksum and metadata
+
+        Raises:
+            FileError: If the file cannot be read
+        """
+        self.logger.debug("Creating document instance for: %s", file_path)
+        checksum = calculate_sha512(file_path)
+        file_size, last_modified = get_file_metadata(file_path)
+
+        return DocumentInstance(
+            path=file_path,
+            file_type=doc_type,
+            checksum=checksum,
+            file_size=file_size,
+            last_modified=last_modified,
+        )
+
+    def _finish_document(
+        self, document_instance: DocumentInstance, document: Document
+    ) -> Path:
+        """Render, cache and save a document after OCR.
+
+        Args:
+            document_instance: The instance the document was produced from
+            document: The OCR result, or a previously processed document
+
+        Returns:
+            Path: Path to the output markdown file
+
+        Raises:
+            DocumentError: If the markdown cannot be saved
+            RenderError: If rendering fails
+        """
+        file_path = document_instance.path
+
+        cached = self._get_processed(document_instance.checksum)
+        if cached is not None:
+            self.logger.info("Using cached result for %s", file_path.name)
+            document = cached
+        else:
+            document = self.renderer.render_markdown(document)
+
+            # Cache the processed document
+            self._remember_processed(document_instance.checksum, document)
+
+            self.logger.info(
+                "Processed %s: %d elements, %d chars markdown",
+                file_path.name,
+                len(document.elements),
+                len(document.markdown or ""),
+            )
+        document_instance.processed_at = document.processed_at
+
+        # Save to output file
+        output_path = self._get_output_path(file_path)
+        self._save_markdown(document, output_path)
+
+        return output_path
+
+    def _get_processed(self, checksum: str) -> Optional[Document]:
+        """Look up a processed document and mark it as recently used.
+
+        Args:
+            checksum: SHA-512 checksum of the document content
+
+        Returns:
+            Optional[Document]: The cached document, or None if not cached
+        """
+        document = self._processed_documents.get(checksum)
+        if document is not None:
+            self._processed_documents.move_to_end(checksum)
+        return document
+
+    def _remember_processed(self, checksum: str, document: Document) -> None:
+        """Cache a processed document, evicting the least recently used.
+
+        Args:
+            checksum: SHA-512 checksum of the document content
+            document: The rendered document
+        """
+        self._processed_documents[checksum] = document
+        self._processed_documents.move_to_end(checksum)
+        if len(self._processed_documents) > self._cache_max:
+            self._processed_documents.popitem(last=False)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index of source files converted on earlier runs.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Index entries by absolute source
+                path, empty if the index is missing or unreadable
+        """
+        try:
+            index = json.loads(self._index_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(
+                "Ignoring unreadable processed index %s: %s",
+                self._index_path,
+                e,
+            )
+            return {}
+
+        return index if isinstance(index, dict) else {}
+
+    def _prune_index(self, dir_path: Path, file_names: Set[str]) -> None:
+        """Drop index entries for files no longer in a directory.
+
+        Only entries of the directory being processed are checked, against
+        its listing, so pruning needs no file system calls per entry.
+
+        Args:
+            dir_path: Directory that was listed
+            file_names: Names of the files found in it
+        """
+        dir_key = str(dir_path.resolve())
+        stale = [
+            source
+            for source in self._index
+            if os.path.dirname(source) == dir_key
+            and os.path.basename(source) not in file_names
+        ]
+        for source in stale:
+            del self._index[source]
+
+    def _get_unchanged_output(
+        self, file_path: Path, file_stat: os.stat_result
+    ) -> Optional[Path]:
+        """Find the output of a file unchanged since it was converted.
+
+        Both the source and its markdown output must be untouched, since
+        another source with the same name may have replaced the output.
+
+        Args:
+            file_path: Path to the source file
+            file_stat: Current stat result of the source file
+
+        Returns:
+            Optional[Path]: The existing output path, or None if the file
+                needs processing or every file is being converted again
+        """
+        if self.force:
+            return None
+
+        entry = self._index.get(str(file_path.resolve()))
+        if entry is None:
+            return None
+
+        output_path = self._get_output_path(file_path)
+        try:
+            if entry == _index_entry(file_stat, output_path):
+                return output_path
+        except OSError:
+            pass
+        return None
+
+    def _record_output(
+        self, file_path: Path, file_stat: os.stat_result, output_path: Path
+    ) -> None:
+        """Record a converted source file in the processed index.
+
+        Args:
+            file_path: Path to the source file
+            file_stat: Stat result of the source file taken before reading
+            output_path: Path to the markdown output written for it
+        """
+        try:
+            self._index[str(file_path.resolve())] = _index_entry(
+                file_stat, output_path
+            )
+        except OSError as e:
+            self.logger.warning(
+                "Failed to index output for %s: %s", file_path, e
+            )
+
+    def _save_index(self) -> None:
+        """Atomically write the processed index to the cache directory.
+
+        A failed write is only logged; affected files are processed again
+        on the next run.
+        """
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(
+                self._index_path, json.dumps(self._index).encode("utf-8")
+            )
+        except OSError as e:
+            self.logger.warning(
+                "Failed to write processed index %s: %s", self._index_path, e
+            )
+
     def _get_output_path(self, input_path: Path) -> Path:
         """Get the output path for a processed document.
 
@@ -208,7 +553,7 @@ class DocumentProcessor:
         """
         output_dir = Path(config.settings.app.output_dir)
         output_path = output_dir / f"{input_path.stem}.md"
-        self.logger.debug(f"Output path for {input_path}: {output_path}")
+        self.logger.debug("Output path for %s: %s", input_path, output_path)
         return output_path
 
     def _save_markdown(self, document: Document, output_path: Path) -> None:
@@ -229,33 +574,21 @@ class DocumentProcessor:
         try:
             # Ensure parent directory exists
             self.logger.debug(
-                f"Creating output directory if needed: {output_path.parent}"
+                "Creating output directory if needed: %s", output_path.parent
             )
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Calculate estimated size
-            estimated_size = len(document.markdown) / 1024
+            # Written atomically, so an interrupted write never leaves a
+            # truncated output file
+            data = document.markdown.encode("utf-8")
+            atomic_write_bytes(output_path, data)
             self.logger.debug(
-                f"Writing approximately {estimated_size:.2f} KB to {output_path}"
+                "Wrote %.2f KB to %s", len(data) / 1024, output_path
             )
 
-            # Write markdown to file
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(document.markdown)
-
-            # Verify file was written
-            if not output_path.exists():
-                error_msg = f"File was not written: {output_path}"
-                self.logger.error(error_msg)
-                raise DocumentError(error_msg)
-
-            # Get actual file size
-            actual_size = output_path.stat().st_size / 1024
-            self.logger.debug(f"Wrote {actual_size:.2f} KB to {output_path}")
-
-            self.logger.info(f"Saved markdown to: {output_path}")
+            self.logger.info("Saved markdown to: %s", output_path)
 
         except OSError as e:
             error_msg = f"Failed to save markdown to {output_path}"
-            self.logger.error(f"{error_msg}: {str(e)}")
+            self.logger.error("%s: %s", error_msg, e)
             raise DocumentError(error_msg, detail=str(e))
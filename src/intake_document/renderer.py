@@ -1,6 +1,7 @@
 """Markdown rendering for document elements."""
 
 import logging
+from typing import Any, Callable, Dict, List, Type
 
 # Local application imports
 from intake_document.models.document import (
@@ -19,6 +20,14 @@ class MarkdownRenderer:
     def __init__(self) -> None:
         """Initialize the markdown renderer."""
         self.logger = logging.getLogger(__name__)
+
+        # Render method for each element class, looked up by exact type
+        self._renderers: Dict[Type[DocumentElement], Callable[[Any], str]] = {
+            TextElement: self._render_text_element,
+            TableElement: self._render_table_element,
+            ImageElement: self._render_image_element,
+        }
+
         self.logger.debug("MarkdownRenderer initialized")
 
     def render_markdown(self, document: Document) -> Document:
@@ -35,36 +44,43 @@ class MarkdownRenderer:
         """
 
         try:
-            # Start with an empty string
-            markdown = ""
+            # Collect the pieces and join them once at the end, so long
+            # documents are not copied on every append
+            parts: List[str] = []
 
             # Check if we have elements to render
             if not document.elements:
                 self.logger.warning("No elements to render in document")
 
             # Process each element in the document
+            element_count = len(document.elements)
             for i, element in enumerate(document.elements):
                 # Add spacing between elements
-                if markdown:
-                    markdown += "\n\n"
+                if parts:
+                    parts.append("\n\n")
 
                 try:
                     # Render the element based on its type
                     self.logger.debug(
-                        f"Rendering element {i + 1}/{len(document.elements)}: {element.element_type}"
+                        "Rendering element %d/%d: %s",
+                        i + 1,
+                        element_count,
+                        element.element_type,
                     )
 
-                    if isinstance(element, TextElement):
-                        markdown += self._render_text_element(element)
-                    elif isinstance(element, TableElement):
-                        markdown += self._render_table_element(element)
-                    elif isinstance(element, ImageElement):
-                        markdown += self._render_image_element(element)
+                    render = self._renderers.get(type(element))
+                    if render is not None:
+                        rendered = render(element)
                     else:
                         self.logger.warning(
-                            f"Unknown element type: {type(element)}"
+                            "Unknown element type: %s", type(element)
                         )
-                        markdown += f"<!-- Unsupported element type: {type(element).__name__} -->"
+                        rendered = f"<!-- Unsupported element type: {type(element).__name__} -->"
+
+                    # Skip empty pieces so they do not count as content
+                    # when spacing the next element
+                    if rendered:
+                        parts.append(rendered)
 
                 except Exception as e:
                     # Log the error but continue with other elements
@@ -72,12 +88,12 @@ class MarkdownRenderer:
                     self.logger.error(f"{error_msg}: {str(e)}")
 
                     # Add a comment in the markdown noting the error
-                    markdown += (
+                    parts.append(
                         f"\n\n<!-- Error rendering element: {str(e)} -->\n\n"
                     )
 
             # Store the markdown in the document
-            document.markdown = markdown
+            document.markdown = "".join(parts)
 
             return document
 
@@ -98,7 +114,7 @@ class MarkdownRenderer:
         Raises:
             RenderError: If the element has invalid properties
         """
-        self.logger.debug(f"Rendering text element: {element.content[:20]}...")
+        self.logger.debug("Rendering text element: %.20s...", element.content)
 
         # Validate content
         if not element.content:
@@ -109,7 +125,7 @@ class MarkdownRenderer:
         if element.level is not None:
             if 1 <= element.level <= 6:
                 self.logger.debug(
-                    f"Rendering as level {element.level} heading"
+                    "Rendering as level %d heading", element.level
                 )
                 return f"{'#' * element.level} {element.content}"
             else:
@@ -118,14 +134,17 @@ class MarkdownRenderer:
                 )
                 return element.content
 
+        # Nested list items keep their leading indentation
+        indent = " " * element.indent
+
         # If it's a list item, prefix with - or *
         if element.is_list_item:
             self.logger.debug("Rendering as list item")
-            return f"- {element.content}"
+            return f"{indent}- {element.content}"
 
         # Otherwise it's a regular paragraph
         self.logger.debug("Rendering as paragraph")
-        return element.content
+        return indent + element.content
 
     def _render_table_element(self, element: TableElement) -> str:
         """Render a table element as markdown.
@@ -140,7 +159,9 @@ class MarkdownRenderer:
             RenderError: If the table structure is invalid
         """
         self.logger.debug(
-            f"Rendering table with {len(element.headers)} columns, {len(element.rows)} rows"
+            "Rendering table with %d columns, %d rows",
+            len(element.headers),
+            len(element.rows),
         )
 
         # Validate table structure
@@ -150,34 +171,40 @@ class MarkdownRenderer:
             raise RenderError(error_msg)
 
         # Make sure all rows have the same number of columns as headers
+        n_cols = len(element.headers)
         for i, row in enumerate(element.rows):
-            if len(row) != len(element.headers):
+            if len(row) != n_cols:
                 self.logger.warning(
-                    f"Row {i + 1} has {len(row)} columns, but table has {len(element.headers)} headers. "
-                    "Adjusting row to match."
+                    "Row %d has %d columns, but table has %d headers. "
+                    "Adjusting row to match.",
+                    i + 1,
+                    len(row),
+                    n_cols,
                 )
                 # Pad or truncate row to match header count
-                if len(row) < len(element.headers):
-                    row.extend([""] * (len(element.headers) - len(row)))
+                if len(row) < n_cols:
+                    row.extend([""] * (n_cols - len(row)))
                 else:
-                    row = row[: len(element.headers)]
+                    row = row[:n_cols]
 
         try:
-            # Create header row
-            md_table = "| " + " | ".join(element.headers) + " |\n"
+            # Escape pipe characters in cell content to avoid breaking the table
+            escaped_headers = [
+                header.replace("|", "\\|") for header in element.headers
+            ]
 
-            # Create separator row
-            md_table += (
-                "| " + " | ".join(["---"] * len(element.headers)) + " |\n"
-            )
+            # Create header and separator rows
+            md_rows = [
+                "| " + " | ".join(escaped_headers) + " |",
+                "| " + " | ".join(["---"] * n_cols) + " |",
+            ]
 
             # Create data rows
             for row in element.rows:
-                # Escape pipe characters in cell content to avoid breaking the table
                 escaped_row = [cell.replace("|", "\\|") for cell in row]
-                md_table += "| " + " | ".join(escaped_row) + " |\n"
+                md_rows.append("| " + " | ".join(escaped_row) + " |")
 
-            return md_table.rstrip()  # Remove trailing newline
+            return "\n".join(md_rows)
 
         except Exception as e:
             error_msg = "Failed to render table element"
@@ -196,7 +223,7 @@ class MarkdownRenderer:
         Raises:
             RenderError: If the image element has invalid properties
         """
-        self.logger.debug(f"Rendering image element: {element.image_id}")
+        self.logger.debug("Rendering image element: %s", element.image_id)
 
         # Validate image ID
         if not element.image_id:
@@ -207,7 +234,7 @@ class MarkdownRenderer:
         try:
             # Use standard markdown image syntax
             alt_text = element.caption if element.caption else "Image"
-            self.logger.debug(f"Using alt text: {alt_text}")
+            self.logger.debug("Using alt text: %s", alt_text)
 
             return f"![{alt_text}](images/{element.image_id}.png)"
 
@@ -1,6 +1,7 @@
 """File utility functions for document processing."""
 
 import hashlib
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Tuple
@@ -8,6 +9,16 @@ from typing import Tuple
 from intake_document.models.document import DocumentType
 from intake_document.utils.exceptions import FileError, FileTypeError
 
+# Supported file extensions and their document types
+SUPPORTED_TYPES = {
+    ".pdf": DocumentType.PDF,
+    ".png": DocumentType.PNG,
+    ".jpg": DocumentType.JPG,
+    ".jpeg": DocumentType.JPEG,
+    ".tiff": DocumentType.TIFF,
+    ".docx": DocumentType.DOCX,
+}
+
 
 def calculate_sha512(file_path: Path) -> str:
     """Calculate SHA-512 checksum of a file.
@@ -34,6 +45,28 @@ def calculate_sha512(file_path: Path) -> str:
         )
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a file through a temporary sibling renamed into place.
+
+    An interrupted write never leaves a truncated file at ``path``.
+
+    Args:
+        path: Destination path
+        data: Encoded content to write
+
+    Raises:
+        OSError: If the file cannot be written; no temporary file is
+            left behind
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def get_file_metadata(file_path: Path) -> Tuple[int, datetime]:
     """Get file size and modification time.
 
@@ -102,15 +135,6 @@ def get_document_type(file_path: Path) -> DocumentType:
     Raises:
         FileTypeError: If file type is not supported
     """
-    SUPPORTED_TYPES = {
-        ".pdf": DocumentType.PDF,
-        ".png": DocumentType.PNG,
-        ".jpg": DocumentType.JPG,
-        ".jpeg": DocumentType.JPEG,
-        ".tiff": DocumentType.TIFF,
-        ".docx": DocumentType.DOCX,
-    }
-
     ext = file_path.suffix.lower()
     doc_type = SUPPORTED_TYPES.get(ext)
 
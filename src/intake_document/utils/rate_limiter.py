@@ -0,0 +1,35 @@
+"""Request rate limiting for external API calls."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls evenly at a fixed rate."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_second: Maximum sustained number of calls per second
+
+        Raises:
+            ValueError: If the rate is not positive
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            # Reserve the next slot before sleeping so waiters queue up
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
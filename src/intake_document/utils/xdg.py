@@ -42,7 +42,7 @@ class XDGPaths:
         # Runtime directory support
         self._runtime_dir = self._get_runtime_dir() / app_name
 
-        self.logger.debug(f"Initialized XDG paths for {app_name}")
+        self.logger.debug("Initialized XDG paths for %s", app_name)
 
     def _get_runtime_dir(self) -> Path:
         """Get the XDG runtime directory, with fallback.
@@ -91,7 +91,7 @@ class XDGPaths:
         for directory, dir_type in dirs_to_create:
             try:
                 self.logger.debug(
-                    f"Ensuring {dir_type} directory exists: {directory}"
+                    "Ensuring %s directory exists: %s", dir_type, directory
                 )
                 directory.mkdir(parents=True, exist_ok=True, mode=0o700)
             except (OSError, PermissionError) as e:
@@ -189,17 +189,17 @@ class XDGPaths:
         Returns:
             Optional[Path]: Path to the first matching file, or None if not found
         """
-        self.logger.debug(f"Searching for config file: {filename}")
+        self.logger.debug("Searching for config file: %s", filename)
 
         # Check each config directory in order of preference
         for config_dir in self.config_dirs:
             file_path = config_dir / filename
             if file_path.exists() and file_path.is_file():
-                self.logger.debug(f"Found config file at: {file_path}")
+                self.logger.debug("Found config file at: %s", file_path)
                 return file_path
 
         self.logger.debug(
-            f"Config file '{filename}' not found in any config directory"
+            "Config file '%s' not found in any config directory", filename
         )
         return None
 
@@ -212,16 +212,16 @@ class XDGPaths:
         Returns:
             Optional[Path]: Path to the first matching file, or None if not found
         """
-        self.logger.debug(f"Searching for data file: {filename}")
+        self.logger.debug("Searching for data file: %s", filename)
 
         # Check each data directory in order of preference
         for data_dir in self.data_dirs:
             file_path = data_dir / filename
             if file_path.exists() and file_path.is_file():
-                self.logger.debug(f"Found data file at: {file_path}")
+                self.logger.debug("Found data file at: %s", file_path)
                 return file_path
 
         self.logger.debug(
-            f"Data file '{filename}' not found in any data directory"
+            "Data file '%s' not found in any data directory", filename
         )
         return None
@@ -35,6 +35,14 @@ def test_config_env_vars():
     assert settings.app.output_dir == "./output"
 
 
+@patch.dict(os.environ, {"INTAKE_DOCUMENT_BATCH_SIZE": "12"}, clear=True)
+def test_config_batch_size_env_var():
+    """Test that the OCR batch size can be set from the environment."""
+    config = Config()
+
+    assert config.settings.mistral.batch_size == 12
+
+
 def test_show_config():
     """Test that the show_config method returns the correct dictionary."""
     config = Config()
@@ -0,0 +1,31 @@
+"""Tests for the file utility functions."""
+
+import pytest
+
+from intake_document.utils.file_utils import atomic_write_bytes
+
+
+def test_atomic_write_bytes_replaces_file(tmp_path):
+    """Test that the new content replaces the file in one step."""
+    path = tmp_path / "out.md"
+    path.write_bytes(b"old")
+
+    atomic_write_bytes(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_bytes_cleans_up_on_failure(tmp_path, monkeypatch):
+    """Test that a failed write leaves no temporary file behind."""
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(
+        "intake_document.utils.file_utils.os.replace", fail_replace
+    )
+
+    with pytest.raises(OSError):
+        atomic_write_bytes(tmp_path / "key.md", b"text")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,558 @@
+"""Tests for the Mistral OCR response parsing."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from mistralai.models import SDKError
+
+from intake_document.config import config
+from intake_document.models.document import (
+    ImageElement,
+    TableElement,
+    TextElement,
+)
+from intake_document.ocr import CACHE_VERSION, MistralOCR
+from intake_document.utils.exceptions import APIError, OCRError
+
+SAMPLE_MARKDOWN = """# Sample Document
+
+This is a sample
+paragraph.
+
+- First item
+- Second item
+
+| Column 1 | Column 2 |
+| --- | :---: |
+| Data 1 | Data 2 |
+
+![A sample image](img-0.jpeg)
+"""
+
+
+def test_client_created_lazily(monkeypatch):
+    """Test that the Mistral client is built once, on first use."""
+    monkeypatch.setattr(config.settings.mistral, "api_key", "test-key")
+    ocr = MistralOCR()
+
+    assert ocr._client is None
+    assert ocr.client is ocr.client
+    assert ocr._client is not None
+
+
+def test_client_created_once_across_threads(monkeypatch):
+    """Test that concurrent first uses share a single Mistral client."""
+    monkeypatch.setattr(config.settings.mistral, "api_key", "test-key")
+    ocr = MistralOCR()
+    created = []
+
+    def slow_client(**kwargs):
+        time.sleep(0.05)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr("intake_document.ocr.Mistral", slow_client)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        clients = list(executor.map(lambda _: ocr.client, range(5)))
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+
+
+def test_client_without_api_key(monkeypatch):
+    """Test that no client is created without an API key."""
+    monkeypatch.setattr(config.settings.mistral, "api_key", None)
+    ocr = MistralOCR()
+
+    assert ocr.client is None
+
+
+def test_cache_dir_expands_home(tmp_path, monkeypatch):
+    """Test that a cache directory under ~ resolves to the home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(config.settings.app, "cache_dir", "~/cache")
+
+    assert MistralOCR().cache_dir == tmp_path / "cache" / "ocr"
+
+
+def test_extract_elements_from_text():
+    """Test splitting markdown text into document elements."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(SAMPLE_MARKDOWN)
+
+    assert result == [
+        TextElement(element_index=0, content="Sample Document", level=1),
+        TextElement(element_index=1, content="This is a sample paragraph."),
+        TextElement(element_index=2, content="First item", is_list_item=True),
+        TextElement(element_index=3, content="Second item", is_list_item=True),
+        TableElement(
+            element_index=4,
+            headers=["Column 1", "Column 2"],
+            rows=[["Data 1", "Data 2"]],
+        ),
+        ImageElement(
+            element_index=5, image_id="img-0", caption="A sample image"
+        ),
+    ]
+
+
+def test_extract_elements_indexes_flushed_paragraphs():
+    """Test that a paragraph closed by a marker line keeps its position."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text("Intro text\n## Next\n- item")
+
+    assert [element.element_index for element in result] == [0, 1, 2]
+    assert result[0].content == "Intro text"
+    assert result[1].level == 2
+    assert result[2].is_list_item is True
+
+
+def test_extract_elements_handles_windows_line_endings():
+    """Test that CRLF line endings split lines like LF."""
+    ocr = MistralOCR()
+    crlf_markdown = SAMPLE_MARKDOWN.replace("\n", "\r\n")
+
+    assert ocr._extract_elements_from_text(
+        crlf_markdown
+    ) == ocr._extract_elements_from_text(SAMPLE_MARKDOWN)
+
+
+def test_extract_elements_ignores_marker_lookalikes():
+    """Test that lines only resembling markers stay paragraph text."""
+    ocr = MistralOCR()
+    text = "#hashtag\n####### seven\n-dash\n--\n2024 was a year"
+
+    result = ocr._extract_elements_from_text(text)
+
+    assert result == [
+        TextElement(
+            element_index=0,
+            content="#hashtag ####### seven -dash -- 2024 was a year",
+        )
+    ]
+
+
+def test_extract_elements_keeps_thematic_breaks():
+    """Test that thematic breaks are not taken for list items."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text("Above\n* * *\n- item\n___")
+
+    assert result == [
+        TextElement(element_index=0, content="Above"),
+        TextElement(element_index=1, content="* * *"),
+        TextElement(element_index=2, content="item", is_list_item=True),
+        TextElement(element_index=3, content="___"),
+    ]
+
+
+def test_extract_elements_keeps_list_nesting():
+    """Test that nested and alternative list markers keep their structure."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "+ outer\n  - inner\n\t* deeper\n1) first\n   2) second"
+    )
+
+    assert result == [
+        TextElement(element_index=0, content="outer", is_list_item=True),
+        TextElement(
+            element_index=1, content="inner", is_list_item=True, indent=2
+        ),
+        TextElement(
+            element_index=2, content="deeper", is_list_item=True, indent=4
+        ),
+        TextElement(element_index=3, content="1) first"),
+        TextElement(element_index=4, content="2) second", indent=3),
+    ]
+
+
+def test_extract_elements_keeps_indented_code_verbatim():
+    """Test that indented code after a blank line keeps its lines."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "Example:\n\n    x = 1\n    y = 2\nDone\n    wrapped"
+    )
+
+    assert [element.content for element in result] == [
+        "Example:",
+        "    x = 1\n    y = 2",
+        "Done wrapped",
+    ]
+
+
+def test_extract_elements_keeps_text_after_image():
+    """Test that a caption following an image becomes a paragraph."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "![img-0.jpeg](img-0.jpeg) Figure 1: revenue by quarter"
+    )
+
+    assert result == [
+        ImageElement(element_index=0, image_id="img-0", caption="img-0.jpeg"),
+        TextElement(element_index=1, content="Figure 1: revenue by quarter"),
+    ]
+
+
+def test_extract_elements_splits_images_on_one_line():
+    """Test that each image on a line becomes its own element."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "![a](img-0.jpeg) ![b](img-1.jpeg)"
+    )
+
+    assert result == [
+        ImageElement(element_index=0, image_id="img-0", caption="a"),
+        ImageElement(element_index=1, image_id="img-1", caption="b"),
+    ]
+
+
+def test_extract_elements_keeps_text_between_images():
+    """Test that text between two images becomes a paragraph."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "![a](img-0.jpeg) Left and right ![b](img-1.jpeg) Figure 2"
+    )
+
+    assert result == [
+        ImageElement(element_index=0, image_id="img-0", caption="a"),
+        TextElement(element_index=1, content="Left and right"),
+        ImageElement(element_index=2, image_id="img-1", caption="b"),
+        TextElement(element_index=3, content="Figure 2"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "image_url",
+    [
+        "./images/img-0.jpeg",
+        "https://cdn.example.com/a/img-0.jpeg",
+        "img-0.jpeg?size=large",
+    ],
+)
+def test_extract_elements_image_id_from_url(image_url):
+    """Test that the image id is the file name of the image path."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(f"![Chart]({image_url})")
+
+    assert result == [
+        ImageElement(element_index=0, image_id="img-0", caption="Chart")
+    ]
+
+
+def test_extract_elements_keeps_fenced_blocks_verbatim():
+    """Test that code and math blocks keep their line breaks."""
+    ocr = MistralOCR()
+    code = "```python\ndef f():\n    return 1\n```"
+    math = "$$\nx = y^2\n$$"
+
+    result = ocr._extract_elements_from_text(
+        f"Intro\n{code}\n{math}\n$$a + b$$"
+    )
+
+    assert [element.content for element in result] == [
+        "Intro",
+        code,
+        math,
+        "$$a + b$$",
+    ]
+
+
+def test_extract_elements_keeps_quote_lines():
+    """Test that block quote lines are not joined into one line."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "> first quoted\n> second quoted\nAfter the quote"
+    )
+
+    assert [element.content for element in result] == [
+        "> first quoted\n> second quoted",
+        "After the quote",
+    ]
+
+
+def test_extract_elements_keeps_escaped_table_pipes():
+    """Test that escaped pipes stay inside their table cell."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "| Expr | Value |\n| --- | --- |\n| x \\| y | 1 |"
+    )
+
+    assert result == [
+        TableElement(
+            element_index=0,
+            headers=["Expr", "Value"],
+            rows=[["x | y", "1"]],
+        )
+    ]
+
+
+def test_extract_elements_keeps_dash_only_table_rows():
+    """Test that only the row under the header is dropped as separator."""
+    ocr = MistralOCR()
+
+    result = ocr._extract_elements_from_text(
+        "| Item | Qty |\n| --- | --- |\n| Pens | 2 |\n| - | - |"
+    )
+
+    assert result == [
+        TableElement(
+            element_index=0,
+            headers=["Item", "Qty"],
+            rows=[["Pens", "2"], ["-", "-"]],
+        )
+    ]
+
+
+def test_extract_elements_from_empty_text():
+    """Test that text without content yields no elements."""
+    ocr = MistralOCR()
+
+    assert ocr._extract_elements_from_text("\n\n") == []
+
+
+def test_get_ocr_text_joins_pages():
+    """Test that page markdown from the OCR response is joined."""
+    ocr = MistralOCR()
+    ocr_response = SimpleNamespace(
+        pages=[
+            SimpleNamespace(markdown="# Page One"),
+            SimpleNamespace(markdown="Second page text."),
+        ]
+    )
+
+    text = ocr._get_ocr_text(ocr_response)
+
+    assert text == "# Page One\n\nSecond page text."
+
+
+def test_parse_ocr_text_keeps_unstructured_text():
+    """Test that text without markdown structure becomes one paragraph."""
+    ocr = MistralOCR()
+
+    result = ocr._parse_ocr_text("  raw text  ")
+
+    assert result == [TextElement(element_index=0, content="raw text")]
+
+
+def test_process_with_ocr_api_uses_cache(tmp_path, monkeypatch):
+    """Test that a cached OCR result skips the API call."""
+    ocr = MistralOCR()
+    ocr.cache_dir = tmp_path
+    cache_key = f"abc123_{ocr.model}_{CACHE_VERSION}"
+    (tmp_path / f"{cache_key}.md").write_text("# Cached")
+
+    def fail_fetch(_):
+        raise AssertionError("OCR API should not be called")
+
+    monkeypatch.setattr(ocr, "_fetch_ocr_text", fail_fetch)
+
+    elements = ocr._process_with_ocr_api(Path("doc.pdf"), "abc123")
+
+    assert len(elements) == 1
+    assert elements[0].content == "Cached"
+    assert (tmp_path / f"{cache_key}.json").exists()
+
+
+def test_process_with_ocr_api_stores_result(tmp_path, monkeypatch):
+    """Test that a fresh OCR result is written to the cache."""
+    ocr = MistralOCR()
+    ocr.cache_dir = tmp_path / "ocr"
+    monkeypatch.setattr(ocr, "_fetch_ocr_text", lambda _: "Some text.")
+
+    elements = ocr._process_with_ocr_api(Path("doc.pdf"), "def456")
+
+    cache_key = f"def456_{ocr.model}_{CACHE_VERSION}"
+    assert (ocr.cache_dir / f"{cache_key}.md").read_text() == "Some text."
+    monkeypatch.setattr(ocr, "_fetch_ocr_text", None)
+    assert ocr._process_with_ocr_api(Path("doc.pdf"), "def456") == elements
+
+
+def test_load_cached_elements_ignores_corrupt_entry(tmp_path):
+    """Test that an unreadable cache entry is treated as a miss."""
+    ocr = MistralOCR()
+    ocr.cache_dir = tmp_path
+    (tmp_path / "bad_key.json").write_bytes(b'[{"element_type": "?"}')
+
+    assert ocr._load_cached_elements("bad_key") is None
+
+
+def test_iter_documents_yields_errors(monkeypatch):
+    """Test that a failing document yields its exception in place."""
+    ocr = MistralOCR()
+
+    def fake_process(instance):
+        if instance == "bad":
+            raise OCRError("failed")
+        return instance.upper()
+
+    monkeypatch.setattr(ocr, "process_document", fake_process)
+
+    results = dict(ocr.iter_documents(["a", "bad"]))
+
+    assert results["a"] == "A"
+    assert isinstance(results["bad"], OCRError)
+
+
+def test_iter_documents_yields_in_completion_order(monkeypatch):
+    """Test that finished documents are yielded before slower ones."""
+    ocr = MistralOCR()
+    released = threading.Event()
+
+    def fake_process(instance):
+        if instance == "slow":
+            assert released.wait(timeout=5)
+        return instance.upper()
+
+    monkeypatch.setattr(ocr, "process_document", fake_process)
+
+    results = ocr.iter_documents(["slow", "fast"])
+
+    assert next(results) == ("fast", "FAST")
+    released.set()
+    assert list(results) == [("slow", "SLOW")]
+
+
+def test_iter_documents_runs_full_batch_concurrently(monkeypatch):
+    """Test that batch_size documents are processed at the same time."""
+    ocr = MistralOCR()
+    ocr.batch_size = 8
+    barrier = threading.Barrier(ocr.batch_size, timeout=5)
+
+    def fake_process(instance):
+        barrier.wait()
+        return instance
+
+    monkeypatch.setattr(ocr, "process_document", fake_process)
+
+    results = dict(ocr.iter_documents(list(range(8))))
+
+    assert results == {index: index for index in range(8)}
+
+
+def test_iter_documents_stops_when_closed_early(monkeypatch):
+    """Test that closing the iterator cancels documents not yet started."""
+    ocr = MistralOCR()
+    ocr.batch_size = 1
+    released = threading.Event()
+    processed = []
+
+    def fake_process(instance):
+        processed.append(instance)
+        if instance:
+            assert released.wait(timeout=5)
+        return instance
+
+    monkeypatch.setattr(ocr, "process_document", fake_process)
+
+    results = ocr.iter_documents(list(range(20)))
+    assert next(results) == (0, 0)
+    results.close()
+    released.set()
+    time.sleep(0.1)
+
+    # Only the document already running when the iterator closed remains
+    assert processed in ([0], [0, 1])
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (SDKError("Service unavailable", status_code=503), APIError),
+        (httpx.ConnectTimeout("timed out"), APIError),
+        (ValueError("Unexpected API response"), OCRError),
+    ],
+)
+def test_fetch_ocr_text_classifies_errors(monkeypatch, error, expected):
+    """Test that failures are classified by exception type, not message."""
+    ocr = MistralOCR()
+
+    def fail(_):
+        raise error
+
+    monkeypatch.setattr(ocr, "_prepare_file_for_upload", fail)
+
+    with pytest.raises(expected) as exc_info:
+        ocr._fetch_ocr_text(Path("doc.pdf"))
+    assert exc_info.value.__cause__ is error
+
+
+def test_call_with_retry_retries_transient_errors(monkeypatch):
+    """Test that rate-limit errors are retried until the call succeeds."""
+    ocr = MistralOCR()
+    ocr.max_retries = 3
+    monkeypatch.setattr("intake_document.ocr.time.sleep", lambda _: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise SDKError("Too many requests", status_code=429)
+        return "ok"
+
+    assert ocr._call_with_retry(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_call_with_retry_ignores_error_wording(monkeypatch):
+    """Test that non-API errors are not retried because of their message."""
+    ocr = MistralOCR()
+    ocr.max_retries = 3
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise ValueError("timeout: rate limit 429")
+
+    with pytest.raises(ValueError):
+        ocr._call_with_retry(failing)
+    assert len(attempts) == 1
+
+
+def test_call_with_retry_honors_retry_after(monkeypatch):
+    """Test that a Retry-After header lengthens the backoff delay."""
+    ocr = MistralOCR()
+    ocr.max_retries = 1
+    delays = []
+    monkeypatch.setattr("intake_document.ocr.time.sleep", delays.append)
+    response = httpx.Response(429, headers={"Retry-After": "12"})
+    attempts = []
+
+    def throttled():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise SDKError("Too many requests", 429, raw_response=response)
+        return "ok"
+
+    assert ocr._call_with_retry(throttled) == "ok"
+    assert delays[0] == 12.0
+
+
+def test_call_with_retry_raises_permanent_errors(monkeypatch):
+    """Test that client errors are raised without retrying."""
+    ocr = MistralOCR()
+    ocr.max_retries = 3
+    monkeypatch.setattr("intake_document.ocr.time.sleep", lambda _: None)
+    attempts = []
+
+    def unauthorized():
+        attempts.append(1)
+        raise SDKError("Unauthorized", status_code=401)
+
+    with pytest.raises(SDKError):
+        ocr._call_with_retry(unauthorized)
+    assert len(attempts) == 1
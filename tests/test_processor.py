@@ -0,0 +1,303 @@
+"""Tests for the document processor."""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from intake_document.config import config
+from intake_document.models.document import Document, TextElement
+from intake_document.processor import DocumentProcessor
+from intake_document.utils.exceptions import FileError, OCRError
+from intake_document.utils.file_utils import calculate_sha512
+
+
+class FakeOCR:
+    """Stand-in for MistralOCR that records the documents it processes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _make_document(self, instance):
+        return Document(
+            checksum=instance.checksum,
+            elements=[
+                TextElement(element_index=0, content=instance.path.stem)
+            ],
+            processed_at=datetime.now(),
+        )
+
+    def process_document(self, instance):
+        self.calls.append(instance.path.name)
+        return self._make_document(instance)
+
+    def iter_documents(self, instances):
+        for instance in instances:
+            self.calls.append(instance.path.name)
+            if instance.path.stem == "broken":
+                yield instance, OCRError("OCR failed")
+            else:
+                yield instance, self._make_document(instance)
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    """Create a processor writing to a temporary output directory."""
+    monkeypatch.setattr(
+        config.settings.app, "output_dir", str(tmp_path / "output")
+    )
+    monkeypatch.setattr(
+        config.settings.app, "cache_dir", str(tmp_path / "cache")
+    )
+    processor = DocumentProcessor()
+    processor.ocr = FakeOCR()
+    return processor
+
+
+def test_process_file(processor, tmp_path):
+    """Test processing a single file writes its markdown output."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+
+    output_path = processor.process_file(input_file)
+
+    assert output_path.read_text() == "report"
+    assert processor.ocr.calls == ["report.pdf"]
+
+
+def test_process_file_keeps_ocr_errors(processor, tmp_path):
+    """Test that OCR failures propagate without being re-wrapped."""
+    input_file = tmp_path / "broken.pdf"
+    input_file.write_bytes(b"%PDF-1.4 broken")
+    error = OCRError("OCR failed")
+
+    def fail(_):
+        raise error
+
+    processor.ocr.process_document = fail
+
+    with pytest.raises(OCRError) as exc_info:
+        processor.process_file(input_file)
+    assert exc_info.value is error
+
+
+def test_process_file_skips_unchanged_files(processor, tmp_path):
+    """Test that a later run skips files unchanged since conversion."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+    output_path = processor.process_file(input_file)
+
+    rerun = DocumentProcessor()
+    rerun.ocr = FakeOCR()
+
+    assert rerun.process_file(input_file) == output_path
+    assert rerun.ocr.calls == []
+
+    input_file.write_bytes(b"%PDF-1.4 revised report")
+    rerun.process_file(input_file)
+
+    assert rerun.ocr.calls == ["report.pdf"]
+
+
+def test_process_file_redoes_files_from_other_versions(
+    processor, tmp_path, monkeypatch
+):
+    """Test that a cache version change converts unchanged files again."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+    processor.process_file(input_file)
+    monkeypatch.setattr("intake_document.processor.CACHE_VERSION", "next")
+
+    rerun = DocumentProcessor()
+    rerun.ocr = FakeOCR()
+    rerun.process_file(input_file)
+
+    assert rerun.ocr.calls == ["report.pdf"]
+
+
+def test_process_file_force_converts_unchanged_files(processor, tmp_path):
+    """Test that force converts files that the index would skip."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+    processor.process_file(input_file)
+
+    rerun = DocumentProcessor(force=True)
+    rerun.ocr = FakeOCR()
+    rerun.process_file(input_file)
+
+    assert rerun.ocr.calls == ["report.pdf"]
+
+
+def test_processed_index_drops_deleted_sources(processor, tmp_path):
+    """Test that processing a directory prunes its deleted sources."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    kept = input_dir / "kept.pdf"
+    kept.write_bytes(b"%PDF-1.4 kept")
+    removed = input_dir / "removed.pdf"
+    removed.write_bytes(b"%PDF-1.4 removed")
+    processor.process_directory(input_dir)
+    removed.unlink()
+
+    rerun = DocumentProcessor()
+    rerun.ocr = FakeOCR()
+    rerun.process_directory(input_dir)
+
+    assert list(rerun._index) == [str(kept.resolve())]
+    assert list(DocumentProcessor()._index) == [str(kept.resolve())]
+
+
+def test_processed_index_expands_home(processor, tmp_path, monkeypatch):
+    """Test that the processed index is kept under an expanded ~."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(config.settings.app, "cache_dir", "~/cache")
+
+    rerun = DocumentProcessor()
+
+    assert rerun._index_path == tmp_path / "cache" / "processed.json"
+
+
+def test_processed_index_records_absolute_output(
+    processor, tmp_path, monkeypatch
+):
+    """Test that a relative output directory is indexed by absolute path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config.settings.app, "output_dir", "relative")
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+
+    processor.process_file(input_file)
+
+    entry = processor._index[str(input_file.resolve())]
+    assert entry["output"] == str(tmp_path.resolve() / "relative/report.md")
+
+
+def test_process_file_redoes_replaced_output(processor, tmp_path):
+    """Test that an output changed since conversion is written again."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+    output_path = processor.process_file(input_file)
+    output_path.write_text("replaced")
+    os.utime(output_path, ns=(0, 0))
+
+    processor.process_file(input_file)
+
+    assert output_path.read_text() == "report"
+
+
+def test_process_file_replaces_output_atomically(processor, tmp_path):
+    """Test that rewriting an output leaves no temporary files behind."""
+    input_file = tmp_path / "report.pdf"
+    input_file.write_bytes(b"%PDF-1.4 report")
+    output_path = processor._get_output_path(input_file)
+    output_path.write_text("stale")
+
+    processor.process_file(input_file)
+
+    assert output_path.read_text() == "report"
+    assert list(output_path.parent.iterdir()) == [output_path]
+
+
+def test_process_directory(processor, tmp_path):
+    """Test that a directory is processed as one OCR batch."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"first")
+    (input_dir / "b.png").write_bytes(b"second")
+    (input_dir / "broken.pdf").write_bytes(b"third")
+    (input_dir / "notes.txt").write_text("unsupported")
+
+    output_paths = processor.process_directory(input_dir)
+
+    assert sorted(path.name for path in output_paths) == ["a.md", "b.md"]
+    assert sorted(processor.ocr.calls) == ["a.pdf", "b.png", "broken.pdf"]
+
+
+def test_process_directory_skips_unchanged_files(processor, tmp_path):
+    """Test that rerunning a directory only converts changed files."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"first")
+    (input_dir / "b.pdf").write_bytes(b"second")
+    first_paths = processor.process_directory(input_dir)
+    (input_dir / "b.pdf").write_bytes(b"second, edited")
+
+    output_paths = processor.process_directory(input_dir)
+
+    assert output_paths == first_paths
+    assert sorted(processor.ocr.calls) == ["a.pdf", "b.pdf", "b.pdf"]
+
+
+def test_process_directory_skips_unreadable_files(
+    processor, tmp_path, monkeypatch
+):
+    """Test that a file failing its checksum does not stop the batch."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"first")
+    (input_dir / "locked.pdf").write_bytes(b"second")
+    real_sha512 = calculate_sha512
+
+    def fake_sha512(file_path):
+        if file_path.stem == "locked":
+            raise FileError("Permission denied")
+        return real_sha512(file_path)
+
+    monkeypatch.setattr(
+        "intake_document.processor.calculate_sha512", fake_sha512
+    )
+
+    output_paths = processor.process_directory(input_dir)
+
+    assert [path.name for path in output_paths] == ["a.md"]
+    assert processor.ocr.calls == ["a.pdf"]
+
+
+def test_process_directory_reuses_processed_documents(processor, tmp_path):
+    """Test that already processed content is not sent to OCR again."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"same content")
+    processor.process_file(input_dir / "a.pdf")
+    (input_dir / "copy.pdf").write_bytes(b"same content")
+
+    output_paths = processor.process_directory(input_dir)
+
+    assert sorted(path.name for path in output_paths) == ["a.md", "copy.md"]
+    assert processor.ocr.calls == ["a.pdf"]
+
+
+def test_process_directory_sends_duplicate_content_once(processor, tmp_path):
+    """Test that files sharing content in one batch are OCRed once."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"same content")
+    (input_dir / "copy.pdf").write_bytes(b"same content")
+    (input_dir / "other.pdf").write_bytes(b"other content")
+
+    output_paths = processor.process_directory(input_dir)
+
+    assert sorted(path.name for path in output_paths) == [
+        "a.md",
+        "copy.md",
+        "other.md",
+    ]
+    assert len(processor.ocr.calls) == 2
+    assert "other.pdf" in processor.ocr.calls
+
+
+def test_processed_documents_cache_is_bounded(
+    processor, tmp_path, monkeypatch
+):
+    """Test that the least recently used processed document is evicted."""
+    monkeypatch.setattr(processor, "_cache_max", 2)
+    for name in ("a", "b", "c"):
+        input_file = tmp_path / f"{name}.pdf"
+        input_file.write_bytes(name.encode())
+        processor.process_file(input_file)
+
+    (tmp_path / "a_copy.pdf").write_bytes(b"a")
+    processor.process_file(tmp_path / "a_copy.pdf")
+
+    assert processor.ocr.calls == ["a.pdf", "b.pdf", "c.pdf", "a_copy.pdf"]
+    assert len(processor._processed_documents) == 2
@@ -0,0 +1,32 @@
+"""Tests for the rate limiter."""
+
+import pytest
+
+from intake_document.utils import rate_limiter
+from intake_document.utils.rate_limiter import RateLimiter
+
+
+def test_acquire_spaces_requests(monkeypatch):
+    """Test that consecutive calls wait one interval apart."""
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake_sleep)
+    limiter = RateLimiter(requests_per_second=4)
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+
+    assert sleeps == [pytest.approx(0.25), pytest.approx(0.25)]
+
+
+def test_invalid_rate():
+    """Test that a non-positive rate is rejected."""
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_second=0)
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from intake_document.models.document import (
     Document,
+    DocumentElement,
     ElementType,
     ImageElement,
     TableElement,
@@ -53,6 +54,21 @@ def test_render_list_item():
     assert result == "- List item"
 
 
+def test_render_nested_list_item():
+    """Test that a nested list item keeps its indentation."""
+    renderer = MarkdownRenderer()
+    element = TextElement(
+        element_type=ElementType.TEXT,
+        element_index=0,
+        content="Nested item",
+        is_list_item=True,
+        indent=2,
+    )
+    result = renderer._render_text_element(element)
+
+    assert result == "  - Nested item"
+
+
 def test_render_table():
     """Test rendering a table element."""
     renderer = MarkdownRenderer()
@@ -71,6 +87,18 @@ def test_render_table():
     assert result == expected
 
 
+def test_render_table_escapes_pipes():
+    """Test that pipes in header and data cells are escaped."""
+    renderer = MarkdownRenderer()
+    element = TableElement(
+        element_index=0, headers=["a | b", "c"], rows=[["x | y", "z"]]
+    )
+
+    result = renderer._render_table_element(element)
+
+    assert result == "| a \\| b | c |\n| --- | --- |\n| x \\| y | z |"
+
+
 def test_render_image():
     """Test rendering an image element."""
     renderer = MarkdownRenderer()
@@ -85,6 +113,25 @@ def test_render_image():
     assert result == "![Test Image](images/img123.png)"
 
 
+def test_render_unsupported_element():
+    """Test that an element without a renderer becomes a comment."""
+    renderer = MarkdownRenderer()
+    document = Document(
+        checksum="abc123def456",
+        processed_at=datetime.now(),
+        elements=[
+            TextElement(element_index=0, content="Intro"),
+            DocumentElement(element_type=ElementType.TEXT, element_index=1),
+        ],
+    )
+
+    result_doc = renderer.render_markdown(document)
+
+    assert result_doc.markdown == (
+        "Intro\n\n<!-- Unsupported element type: DocumentElement -->"
+    )
+
+
 def test_render_complete_document():
     """Test rendering a complete document with multiple elements."""
     renderer = MarkdownRenderer()